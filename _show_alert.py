@@ -1,128 +1,337 @@
 #!/usr/bin/env python3
 """
-Internal alert display script - launched as separate process
+Internal alert display script - imported by notebook_auto_alert.py and run on a
+background thread, or launched as a separate process when that is unavailable
 DO NOT call this directly - use notebook_auto_alert.py instead
 """
 
+import os
 import sys
-import subprocess
-import tkinter as tk
-from datetime import datetime
+import queue
+import shutil
+import threading
+import time
 
 
-def show_alert_window(success=True, message="", notebook_name=""):
-    """Show the alert window"""
+# Probe once so non-macOS systems don't pay a failed fork+exec on every alert
+_HAS_OSASCRIPT = shutil.which('osascript') is not None
+_HAS_AFPLAY = shutil.which('afplay') is not None
 
-    root = tk.Tk()
-    root.attributes('-topmost', True)
-    root.attributes('-alpha', 0.95)
+# On macOS a native AppleScript dialog replaces the Tk window entirely
+_USE_NATIVE_DIALOG = sys.platform == 'darwin' and _HAS_OSASCRIPT
 
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
+# One hidden Tk root and alert window, built on first use and reused after that
+_ROOT = None
+_WINDOW = {}
+_KEEP_ALIVE = False
+_LOOP_RUNNING = False
+_SCREEN_W = _SCREEN_H = 0
+_ROOT_LOCK = threading.Lock()
+_PENDING = queue.SimpleQueue()
+
+WINDOW_WIDTH = 650
+WINDOW_HEIGHT = 300
+AUTO_CLOSE_MS = 12000
+
+
+def spawn_detached(argv):
+    """
+    Start argv in its own session with output discarded, without waiting
+
+    On POSIX (Python 3.8+) this uses os.posix_spawnp directly. subprocess.Popen
+    only takes its posix_spawn fast path when start_new_session and close_fds
+    are off, otherwise it forks - and fork cost grows with the kernel's RSS.
+    Python's own fds are non-inheritable by default, so nothing leaks into
+    the child without close_fds.
+    """
+    if hasattr(os, 'posix_spawnp'):
+        file_actions = [
+            (os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_WRONLY, 0)
+            for fd in (1, 2)
+        ]
+        try:
+            pid = os.posix_spawnp(argv[0], argv, os.environ,
+                                  file_actions=file_actions, setsid=True)
+        except NotImplementedError:
+            pass  # Platform lacks POSIX_SPAWN_SETSID - use Popen below
+        else:
+            # Reap the child once it exits so it doesn't linger as a zombie
+            threading.Thread(target=os.waitpid, args=(pid, 0), daemon=True).start()
+            return
+
+    import subprocess
+    subprocess.Popen(
+        argv,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        start_new_session=True  # Fully detach from parent
+    )
 
-    if success:
-        bg_color = '#90EE90'  # Pale green (light green)
-        title_text = "✓ NOTEBOOK COMPLETE ✓"
-        sound = "Glass"
-    else:
-        bg_color = '#FFB6C1'  # Pale red (light pink)
-        title_text = "✗ NOTEBOOK ERROR ✗"
-        sound = "Basso"
 
-    root.configure(bg=bg_color)
+def _applescript_quote(text):
+    """Escape text for use inside an AppleScript string literal"""
+    return text.replace('\\', '\\\\').replace('"', '\\"')
 
-    window_width = 650
-    window_height = 300
-    x = (screen_width - window_width) // 2
-    y = (screen_height - window_height) // 2
-    root.geometry(f'{window_width}x{window_height}+{x}+{y}')
 
-    root.title("Notebook Alert")
+def _notification_script(title_text, display_msg, sound):
+    """Build the AppleScript for a notification banner (single line, 100 chars)"""
+    short_msg = _applescript_quote(display_msg[:100].replace('\n', ' '))
+    return (
+        f'display notification "{short_msg}" '
+        f'with title "{_applescript_quote(title_text)}" sound name "{sound}"'
+    )
+
+
+def _build_window():
+    """Create the hidden root and the alert window template"""
+    global _SCREEN_W, _SCREEN_H
+
+    # Imported here so the macOS native dialog works on Pythons without tkinter
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.withdraw()
+    _SCREEN_W, _SCREEN_H = root.winfo_screenwidth(), root.winfo_screenheight()
+
+    window = tk.Toplevel(root)
+    window.withdraw()
+    window.title("Notebook Alert")
+    window.attributes('-topmost', True)
+    window.attributes('-alpha', 0.95)
+    window.protocol('WM_DELETE_WINDOW', _dismiss)
 
-    main_frame = tk.Frame(root, bg=bg_color)
+    main_frame = tk.Frame(window)
     main_frame.pack(expand=True, fill='both', padx=20, pady=20)
 
     title_label = tk.Label(
         main_frame,
-        text=title_text,
         font=('Arial', 32, 'bold'),
-        bg=bg_color,
         fg='white'
     )
     title_label.pack(pady=15)
 
-    time_str = datetime.now().strftime('%I:%M:%S %p')
-
-    # Build display message with notebook name
-    if notebook_name:
-        display_msg = f"{notebook_name}\n\n"
-    else:
-        display_msg = ""
-
-    if message:
-        display_msg += message
-    else:
-        display_msg += f"Completed at {time_str}"
-
     message_label = tk.Label(
         main_frame,
-        text=display_msg,
         font=('Arial', 16),
-        bg=bg_color,
         fg='#2C3E50',  # Dark gray text for better readability
         justify='center',
         wraplength=600
     )
     message_label.pack(pady=15)
 
-    # Button color that contrasts well with pale backgrounds
-    btn_bg = '#2C3E50' if success else '#8B0000'  # Dark gray for success, dark red for error
-
     close_btn = tk.Button(
         main_frame,
         text="OK",
         font=('Arial', 14, 'bold'),
-        command=root.destroy,
-        bg=btn_bg,
+        command=_dismiss,
         fg='white',
         padx=30,
         pady=10
     )
     close_btn.pack(pady=15)
 
-    # Flash effect
-    def flash(count=0):
-        if count < 8:
-            try:
-                current_alpha = root.attributes('-alpha')
-                new_alpha = 0.3 if current_alpha > 0.5 else 0.95
-                root.attributes('-alpha', new_alpha)
-                root.after(150, lambda: flash(count + 1))
-            except:
-                pass
+    _WINDOW.update(
+        window=window,
+        frame=main_frame,
+        title=title_label,
+        message=message_label,
+        button=close_btn,
+        timer=None,
+    )
+    return root
 
-    flash()
 
-    # System notification
+def _dismiss():
+    """Hide the alert window (and shut Tk down unless it is kept alive)"""
     try:
-        subprocess.run([
-            'osascript', '-e',
-            f'display notification "{display_msg[:100]}" '
-            f'with title "{title_text}" sound name "{sound}"'
-        ], check=False, capture_output=True, timeout=2)
+        # Drop the auto-close timer so clicking OK doesn't leave it pending
+        if _WINDOW['timer'] is not None:
+            _ROOT.after_cancel(_WINDOW['timer'])
+            _WINDOW['timer'] = None
+
+        _WINDOW['window'].withdraw()
+        if not _KEEP_ALIVE:
+            _ROOT.destroy()
     except:
         pass
 
-    # Play sound
+
+def _present_safely(success, message, notebook_name):
+    """Show an alert handed over from another thread"""
     try:
-        subprocess.Popen(['afplay', f'/System/Library/Sounds/{sound}.aiff'],
-                       stdout=subprocess.DEVNULL,
-                       stderr=subprocess.DEVNULL)
+        _present(success, message, notebook_name)
+    except:
+        pass  # One broken alert must not block the ones after it
+
+
+def _start_serving():
+    """Runs once mainloop is up: show queued alerts, then take calls directly"""
+    global _LOOP_RUNNING
+
+    with _ROOT_LOCK:
+        _LOOP_RUNNING = True
+        pending = []
+        while not _PENDING.empty():
+            pending.append(_PENDING.get_nowait())
+
+    for alert in pending:
+        _present_safely(*alert)
+
+
+def _alert_text(success, message, notebook_name):
+    """Get the title, display message and sound name for an alert"""
+    if success:
+        title_text = "✓ NOTEBOOK COMPLETE ✓"
+        sound = "Glass"
+    else:
+        title_text = "✗ NOTEBOOK ERROR ✗"
+        sound = "Basso"
+
+    time_str = time.strftime('%I:%M:%S %p')
+
+    # Build display message with notebook name
+    if notebook_name:
+        display_msg = f"{notebook_name}\n\n"
+    else:
+        display_msg = ""
+
+    if message:
+        display_msg += message
+    else:
+        display_msg += f"Completed at {time_str}"
+
+    return title_text, display_msg, sound
+
+
+def _show_native_dialog(success, message, notebook_name):
+    """Show a macOS notification and dialog with one non-blocking osascript call"""
+    title_text, display_msg, sound = _alert_text(success, message, notebook_name)
+    title = _applescript_quote(title_text)
+    icon = "note" if success else "stop"
+
+    try:
+        spawn_detached([
+            'osascript',
+            '-e', _notification_script(title_text, display_msg, sound),
+            '-e', f'display dialog "{_applescript_quote(display_msg)}" '
+                  f'with title "{title}" with icon {icon} buttons {{"OK"}} '
+                  f'default button "OK" giving up after {AUTO_CLOSE_MS // 1000}'
+        ])
     except:
         pass
 
-    root.after(12000, root.destroy)
-    root.mainloop()
+
+def _present(success, message, notebook_name):
+    """Fill in the reused alert window and bring it up"""
+    window = _WINDOW['window']
+    title_text, display_msg, sound = _alert_text(success, message, notebook_name)
+
+    # Pale green (light green) for success, pale red (light pink) for error
+    bg_color = '#90EE90' if success else '#FFB6C1'
+
+    x = (_SCREEN_W - WINDOW_WIDTH) // 2
+    y = (_SCREEN_H - WINDOW_HEIGHT) // 2
+    window.geometry(f'{WINDOW_WIDTH}x{WINDOW_HEIGHT}+{x}+{y}')
+
+    # Button color that contrasts well with pale backgrounds
+    btn_bg = '#2C3E50' if success else '#8B0000'  # Dark gray for success, dark red for error
+
+    window.configure(bg=bg_color)
+    _WINDOW['frame'].configure(bg=bg_color)
+    _WINDOW['title'].configure(text=title_text, bg=bg_color)
+    _WINDOW['message'].configure(text=display_msg, bg=bg_color)
+    _WINDOW['button'].configure(bg=btn_bg)
+
+    window.deiconify()
+    window.lift()
+
+    # Flash effect - precomputed alphas avoid reading '-alpha' back from Tcl
+    alphas = (0.3, 0.95) * 4
+
+    def flash(count=0):
+        if count < len(alphas):
+            try:
+                window.attributes('-alpha', alphas[count])
+                window.after(150, flash, count + 1)
+            except:
+                pass
+
+    flash()
+
+    # System notification
+    if _HAS_OSASCRIPT:
+        script = _notification_script(title_text, display_msg, sound)
+        try:
+            spawn_detached(['osascript', '-e', script])
+        except:
+            pass
+    elif _HAS_AFPLAY:
+        # Play sound - only needed when no notification is there to play it
+        try:
+            spawn_detached(['afplay', f'/System/Library/Sounds/{sound}.aiff'])
+        except:
+            pass
+
+    # Restart the auto-close countdown for this alert
+    if _WINDOW['timer'] is not None:
+        _ROOT.after_cancel(_WINDOW['timer'])
+    _WINDOW['timer'] = _ROOT.after(AUTO_CLOSE_MS, _dismiss)
+
+
+def show_alert_window(success=True, message="", notebook_name="", keep_alive=False):
+    """
+    Show the alert window
+
+    The first call builds the Tk root and runs its mainloop on the calling
+    thread. With keep_alive=True the root stays up (hidden) after the alert
+    closes, and later calls from other threads are scheduled onto that loop
+    with after() - Tcl is threaded, so tkinter marshals them to the Tk
+    thread - reusing the existing window instead of rebuilding it. Calls
+    that arrive before mainloop starts are queued until it does.
+
+    On macOS a native dialog is shown instead and Tk is never started.
+    """
+    global _ROOT, _KEEP_ALIVE, _LOOP_RUNNING
+
+    if _USE_NATIVE_DIALOG:
+        _show_native_dialog(success, message, notebook_name)
+        return
+
+    with _ROOT_LOCK:
+        root = _ROOT
+        if root is not None and not _LOOP_RUNNING:
+            # Tk is starting up on another thread - it shows this once running
+            _PENDING.put((success, message, notebook_name))
+            return
+
+        if root is None:
+            _KEEP_ALIVE = keep_alive
+            _ROOT = _build_window()
+
+    if root is not None:
+        # Tk is running on another thread. Schedule outside the lock: the call
+        # blocks until the Tk thread picks it up, and that thread takes the lock
+        try:
+            root.after(0, _present_safely, success, message, notebook_name)
+        except:
+            pass  # Root was torn down in the meantime
+        return
+
+    try:
+        _present(success, message, notebook_name)
+        if keep_alive:
+            _ROOT.after_idle(_start_serving)
+        _ROOT.mainloop()
+    finally:
+        with _ROOT_LOCK:
+            _ROOT = None
+            _LOOP_RUNNING = False
+            _WINDOW.clear()
+            # Alerts queued for this root belong to it - don't replay them on
+            # whichever root gets built next
+            while not _PENDING.empty():
+                _PENDING.get_nowait()
 
 
 if __name__ == '__main__':
@@ -18,40 +18,39 @@ FEATURES:
 - ✓ Desktop-level alerts
 """
 
-import subprocess
 import sys
 import os
-from pathlib import Path
+import threading
+
+
+_SENTINEL = object()
+_cached_nb_name = _SENTINEL
 
 
 def _get_notebook_name():
+    """Get the current notebook name, detected once per kernel session"""
+    global _cached_nb_name
+
+    if _cached_nb_name is _SENTINEL:
+        _cached_nb_name = _detect_notebook_name()
+
+    return _cached_nb_name
+
+
+def _detect_notebook_name():
     """Get the current notebook name from IPython"""
+    # Not running under IPython - don't import it just to find no shell
+    if 'IPython' not in sys.modules:
+        return None
+
     try:
+        from pathlib import Path
         from IPython import get_ipython
         ip = get_ipython()
 
         if ip is None:
             return None
 
-        # Try to get notebook name from connection file
-        try:
-            connection_file = ip.config.get('IPKernelApp', {}).get('connection_file', '')
-            if connection_file:
-                # Extract notebook name from connection file path
-                import json
-                with open(connection_file, 'r') as f:
-                    pass  # File exists, use its name as hint
-        except:
-            pass
-
-        # Try to get from session history database path
-        try:
-            history_file = ip.history_manager.hist_file
-            # The history file is in ~/.ipython/profile_default/history.sqlite
-            # Not directly useful for notebook name
-        except:
-            pass
-
         # Try to get from user namespace if __file__ is set
         try:
             user_ns = ip.user_ns
@@ -63,6 +62,7 @@ def _get_notebook_name():
             pass
 
         # Fallback: try to get from parent process name
+        # (psutil is only imported here, on the first uncached lookup)
         try:
             import psutil
             current_process = psutil.Process()
@@ -80,34 +80,151 @@ def _get_notebook_name():
         return None
 
 
-def _get_alert_script_path():
-    """Get the path to the alert display script"""
+def _resolve_alert_script():
+    """Find the alert display script (resolved once per kernel session below)"""
+    # Plain os.path rather than pathlib keeps importing this module cheap
     # Check same directory as this script
-    script_dir = Path(__file__).parent
-    alert_script = script_dir / "_show_alert.py"
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    alert_script = os.path.join(script_dir, "_show_alert.py")
 
-    if alert_script.exists():
-        return str(alert_script)
+    if os.path.exists(alert_script):
+        return alert_script
 
     # Check current directory
-    alert_script = Path.cwd() / "_show_alert.py"
-    if alert_script.exists():
-        return str(alert_script)
+    alert_script = os.path.join(os.getcwd(), "_show_alert.py")
+    if os.path.exists(alert_script):
+        return alert_script
 
     # Check home directory
-    alert_script = Path.home() / "_show_alert.py"
-    if alert_script.exists():
-        return str(alert_script)
+    alert_script = os.path.join(os.path.expanduser("~"), "_show_alert.py")
+    if os.path.exists(alert_script):
+        return alert_script
 
     return None
 
 
+# Install location can't change during a session, so only probe the filesystem once
+_ALERT_SCRIPT_PATH = _resolve_alert_script()
+
+
+def _load_alert_module():
+    """Import the alert display script in-process (None if it can't be loaded)"""
+    if not _ALERT_SCRIPT_PATH:
+        return None
+
+    try:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location("_show_alert", _ALERT_SCRIPT_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    except Exception:
+        # Script broken - fall back to running it as a separate process
+        return None
+
+
+# Loaded on the first alert (then kept) so importing this module stays cheap
+_sa = _SENTINEL
+
+
+def _get_alert_module():
+    """Get the in-process alert display module, loading it on first use"""
+    global _sa
+
+    if _sa is _SENTINEL:
+        _sa = _load_alert_module()
+
+    return _sa
+
+
+_forkserver = None
+_PRELOAD_ENV = 'NOTEBOOK_AUTO_ALERT_PRELOAD'
+
+
+def _get_forkserver():
+    """
+    Get the forkserver context used for out-of-process alerts (None on Windows)
+
+    tkinter and this module (which then loads _show_alert) are preloaded into
+    the forkserver, so each alert process is a cheap fork that has already
+    paid for those imports. They are added to whatever preload list is
+    already set, not replacing it.
+    """
+    global _forkserver
+
+    if _forkserver is None:
+        # Only needed on this rarely used path, so don't import it up front
+        import multiprocessing
+        import multiprocessing.forkserver
+
+        if 'forkserver' not in multiprocessing.get_all_start_methods():
+            return None
+
+        ctx = multiprocessing.get_context('forkserver')
+        # There's no public getter for the preload list; default is ['__main__']
+        preload = list(getattr(multiprocessing.forkserver._forkserver,
+                               '_preload_modules', ['__main__']))
+        preload += [name for name in ('tkinter', __name__) if name not in preload]
+        ctx.set_forkserver_preload(preload)
+
+        # Start the server now, flagged so that importing this module there
+        # also loads the alert module (see the bottom of this file)
+        os.environ[_PRELOAD_ENV] = '1'
+        try:
+            multiprocessing.forkserver.ensure_running()
+        finally:
+            os.environ.pop(_PRELOAD_ENV, None)
+
+        _forkserver = ctx
+
+    return _forkserver
+
+
+def _run_alert_thread(success, message, notebook_name):
+    """Entry point for the alert thread - Tk failures (e.g. no $DISPLAY) just warn"""
+    try:
+        # keep_alive leaves the window built for the next alert to reuse
+        _get_alert_module().show_alert_window(success, message, notebook_name, keep_alive=True)
+    except Exception as e:
+        print(f"⚠ Warning: Could not show alert: {e}")
+
+
+def _run_alert_process(success, message, notebook_name):
+    """Entry point for forkserver alert processes"""
+    # The child inherits the kernel's stdout/stderr - discard output like
+    # the spawned-script fallback does
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    os.close(devnull)
+
+    _get_alert_module().show_alert_window(success, message, notebook_name)
+
+
+def _can_use_alert_thread():
+    """Tk can't share the kernel: macOS needs it on the main thread, and %gui tk owns it"""
+    if sys.platform == 'darwin':
+        # Fine when the native osascript dialog is used, since Tk never starts
+        return _get_alert_module()._USE_NATIVE_DIALOG
+
+    if 'IPython' not in sys.modules:
+        return True
+
+    try:
+        from IPython import get_ipython
+        ip = get_ipython()
+        return ip is None or getattr(ip, 'active_eventloop', None) != 'tk'
+    except:
+        return True
+
+
 def _show_alert(success=True, message="", notebook_name=None):
-    """Launch alert in separate process to avoid blocking kernel"""
+    """Show alert on a background thread (or separate process) to avoid blocking kernel"""
 
-    alert_script = _get_alert_script_path()
+    alert_script = _ALERT_SCRIPT_PATH
+    sa = _get_alert_module()
 
-    if not alert_script:
+    if sa is None and not alert_script:
         print("⚠ Warning: _show_alert.py not found. Cannot show desktop alert.")
         print(f"✓ {'SUCCESS' if success else 'ERROR'}: {message}" if message else "")
         return
@@ -118,14 +235,48 @@ def _show_alert(success=True, message="", notebook_name=None):
     if notebook_name is None:
         notebook_name = _get_notebook_name() or ""
 
+    if sa is not None and _can_use_alert_thread():
+        try:
+            # Run the Tk window on a daemon thread - must be the only Tk thread
+            threading.Thread(
+                target=_run_alert_thread,
+                args=(success, message, notebook_name),
+                daemon=True
+            ).start()
+            return
+        except Exception as e:
+            print(f"⚠ Warning: Could not start alert thread: {e}")
+    elif sa is not None:
+        try:
+            ctx = _get_forkserver()
+            if ctx is not None:
+                ctx.Process(
+                    target=_run_alert_process,
+                    args=(success, message, notebook_name),
+                    daemon=True
+                ).start()
+                return
+        except Exception as e:
+            print(f"⚠ Warning: Could not start alert process: {e}")
+
+    if not alert_script:
+        print(f"✓ {'SUCCESS' if success else 'ERROR'}: {message}" if message else "")
+        return
+
     try:
-        # Launch in completely separate process (non-blocking)
-        subprocess.Popen(
-            [sys.executable, alert_script, alert_type, message, notebook_name],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            start_new_session=True  # Fully detach from parent
-        )
+        # Fallback: launch in completely separate process (non-blocking)
+        argv = [sys.executable, alert_script, alert_type, message, notebook_name]
+        if sa is not None:
+            sa.spawn_detached(argv)
+        else:
+            # Script couldn't be loaded here, so neither can its launcher
+            import subprocess
+            subprocess.Popen(
+                argv,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True  # Fully detach from parent
+            )
     except Exception as e:
         print(f"⚠ Warning: Could not launch alert: {e}")
         print(f"✓ {'SUCCESS' if success else 'ERROR'}: {message}" if message else "")
@@ -170,6 +321,10 @@ def _setup_auto_error_detection():
     if _error_handler_installed:
         return
 
+    # Not running under IPython - skip importing it just to find no shell
+    if 'IPython' not in sys.modules:
+        return
+
     try:
         from IPython import get_ipython
         ip = get_ipython()
@@ -218,6 +373,11 @@ def _setup_auto_error_detection():
 # Auto-enable error detection when module is imported
 _setup_auto_error_detection()
 
+# Preloaded into the alert forkserver: load the alert module once there so
+# forked alert processes inherit it instead of each loading it again
+if os.environ.pop(_PRELOAD_ENV, None):
+    _get_alert_module()
+
 
 def enable_alerts():
     """